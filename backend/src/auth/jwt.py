@@ -6,6 +6,8 @@ Features:
     - @require_auth: validates token and injects g.user (payload) and g.user_id
     - @require_app_user: extends @require_auth; ensures application User row exists
     - Optional uoregon.edu domain enforcement
+    - Test-only shortcut: when app.config["TESTING"] is set, X-Test-Sub / X-Test-Email headers
+      stand in for a signed JWT (ignored outside tests)
 
 Why @require_app_user?
     Many routes need a guaranteed application-level user record (for roles, preferences, FK ownership).
@@ -20,11 +22,12 @@ Notes:
 from __future__ import annotations
 
 import os
-from functools import wraps
+import time
+from functools import lru_cache, wraps
 from typing import Callable, Optional
 
 import jwt
-from flask import request, jsonify, g
+from flask import current_app, request, jsonify, g
 
 from backend.src.db.db_init import get_db
 from backend.src.models.models import User
@@ -48,6 +51,16 @@ def _get_bearer_token() -> Optional[str]:
     return auth.split(" ", 1)[1].strip()
 
 
+def _get_test_payload() -> Optional[dict]:
+    """Builds a JWT-like payload from X-Test-Sub / X-Test-Email, only while the app is TESTING."""
+    if not current_app.config.get("TESTING"):
+        return None
+    sub = request.headers.get("X-Test-Sub")
+    if not sub:
+        return None
+    return {"sub": sub, "email": request.headers.get("X-Test-Email")}
+
+
 def decode_token(token: str) -> dict:
     """Decode and verify a Supabase JWT using the shared secret.
 
@@ -57,8 +70,21 @@ def decode_token(token: str) -> dict:
     """
     if not JWT_SECRET:
         raise AuthError("Server is missing SUPABASE_JWT_SECRET env var")
-    payload = jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG], options={"verify_aud": False})
-    return payload
+    payload = _verify_token(token)
+    # A cached verification outlives the token's lifetime, so expiry is re-checked on every call
+    exp = payload.get("exp")
+    if exp is not None and exp <= time.time():
+        raise jwt.ExpiredSignatureError("Signature has expired")
+    return dict(payload)
+
+
+@lru_cache(maxsize=1024)
+def _verify_token(token: str) -> dict:
+    """Verify a token's signature and claims once; clients resend the same token on every request.
+
+    Only successful verifications are cached (exceptions propagate and are not stored).
+    """
+    return jwt.decode(token, JWT_SECRET, algorithms=[JWT_ALG], options={"verify_aud": False})
 
 
 def require_auth(require_uo_domain: bool = False) -> Callable:
@@ -69,17 +95,19 @@ def require_auth(require_uo_domain: bool = False) -> Callable:
     def decorator(fn: Callable) -> Callable:
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            token = _get_bearer_token()
-            if not token:
-                return jsonify({"error": "Missing Authorization: Bearer <token>"}), 401
-            try:
-                payload = decode_token(token)
-            except jwt.ExpiredSignatureError:
-                return jsonify({"error": "Token expired"}), 401
-            except jwt.InvalidTokenError:
-                return jsonify({"error": "Invalid token"}), 401
-            except AuthError as e:
-                return jsonify({"error": str(e)}), 500
+            payload = _get_test_payload()
+            if payload is None:
+                token = _get_bearer_token()
+                if not token:
+                    return jsonify({"error": "Missing Authorization: Bearer <token>"}), 401
+                try:
+                    payload = decode_token(token)
+                except jwt.ExpiredSignatureError:
+                    return jsonify({"error": "Token expired"}), 401
+                except jwt.InvalidTokenError:
+                    return jsonify({"error": "Invalid token"}), 401
+                except AuthError as e:
+                    return jsonify({"error": str(e)}), 500
 
             user_id = payload.get("sub") or payload.get("user_id")
             email = payload.get("email")
@@ -132,17 +160,19 @@ def require_app_user(require_uo_domain: bool = False) -> Callable:
     def decorator(fn: Callable) -> Callable:
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            token = _get_bearer_token()
-            if not token:
-                return jsonify({"error": "Missing Authorization: Bearer <token>"}), 401
-            try:
-                payload = decode_token(token)
-            except jwt.ExpiredSignatureError:
-                return jsonify({"error": "Token expired"}), 401
-            except jwt.InvalidTokenError:
-                return jsonify({"error": "Invalid token"}), 401
-            except AuthError as e:
-                return jsonify({"error": str(e)}), 500
+            payload = _get_test_payload()
+            if payload is None:
+                token = _get_bearer_token()
+                if not token:
+                    return jsonify({"error": "Missing Authorization: Bearer <token>"}), 401
+                try:
+                    payload = decode_token(token)
+                except jwt.ExpiredSignatureError:
+                    return jsonify({"error": "Token expired"}), 401
+                except jwt.InvalidTokenError:
+                    return jsonify({"error": "Invalid token"}), 401
+                except AuthError as e:
+                    return jsonify({"error": str(e)}), 500
 
             user_id = payload.get("sub") or payload.get("user_id")
             email = payload.get("email")
@@ -8,13 +8,26 @@ NOTE: Previous richer initialization (table creation SQL, sample data) was remov
 import os
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import StaticPool
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-if DATABASE_URL:
-	engine = create_engine(DATABASE_URL)
+# Compiled-statement cache entries; sized above the 500 default so the API's and tests'
+# query shapes stay cached instead of being evicted and recompiled
+QUERY_CACHE_SIZE = 1200
+
+if DATABASE_URL and DATABASE_URL.startswith("sqlite") and (DATABASE_URL.endswith(":memory:") or DATABASE_URL.endswith("://")):
+	# In-memory SQLite (tests): every session must share the one connection that holds the database
+	engine = create_engine(
+		DATABASE_URL,
+		query_cache_size=QUERY_CACHE_SIZE,
+		connect_args={"check_same_thread": False},
+		poolclass=StaticPool,
+	)
+elif DATABASE_URL:
+	engine = create_engine(DATABASE_URL, query_cache_size=QUERY_CACHE_SIZE)
 else:
-	engine = create_engine("sqlite:///ducks_local.db")
+	engine = create_engine("sqlite:///ducks_local.db", query_cache_size=QUERY_CACHE_SIZE)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
@@ -25,6 +38,7 @@ def create_tables_if_needed():
 	Behavior:
 	- Always create when using SQLite (safe for local dev disposable db files).
 	- Respect AUTO_CREATE_TABLES flag for non-SQLite engines (to avoid accidental prod schema changes).
+	- Also creates model indexes missing from tables that already exist (see SCHEMA.md for the DDL).
 	"""
 	is_sqlite = engine.dialect.name == "sqlite"
 	if not is_sqlite and os.getenv("AUTO_CREATE_TABLES") not in ("1", "true", "True", "yes"):
@@ -35,6 +49,15 @@ def create_tables_if_needed():
 		print("INFO : created missing tables" + (" (sqlite auto)" if is_sqlite else ""))
 	except Exception as e:
 		print(f"WARN : failed to auto-create tables -> {e}")
+		return
+	# create_all skips tables that already exist, including their indexes; add any index defined since
+	for table in Base.metadata.sorted_tables:
+		for index in table.indexes:
+			try:
+				index.create(bind=engine, checkfirst=True)
+			except Exception as e:
+				# e.g. existing duplicate rows blocking a unique index; warn but continue
+				print(f"WARN : could not create index {index.name} -> {e}")
 
 def ensure_auth_fk():
 
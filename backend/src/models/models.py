@@ -5,8 +5,8 @@ Defines ORM models for all database tables.
 
 from sqlalchemy import (
     Column, Integer, String, Text, Date, Time, Boolean,
-    TIMESTAMP, ForeignKey, CheckConstraint, UniqueConstraint,
-    DECIMAL, func
+    TIMESTAMP, ForeignKey, CheckConstraint, UniqueConstraint, Index,
+    DECIMAL, func, text
 )
 from sqlalchemy.dialects.postgresql import UUID as PG_UUID, JSONB
 from sqlalchemy import JSON as SA_JSON
@@ -184,6 +184,16 @@ class Event(Base):
     __table_args__ = (
         CheckConstraint('end_time > start_time', name='check_valid_time_range'),
         CheckConstraint('date >= CURRENT_DATE', name='check_valid_date'),
+        # Serves the (date, start_time) ordering used by event listings
+        Index('idx_events_date_start_time', 'date', 'start_time'),
+        # Duplicate detection looks events up by exact title
+        Index('idx_events_title', 'title'),
+        # A scraped event is identified by its source page; re-crawls must not insert it twice
+        Index(
+            'uq_events_scraped_external_url', 'external_url', unique=True,
+            postgresql_where=text('is_scraped = true'),
+            sqlite_where=text('is_scraped = true'),
+        ),
     )
     
     # Relationships
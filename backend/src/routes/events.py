@@ -4,6 +4,7 @@ from datetime import date, time, datetime
 from typing import Optional
 
 from flask import Blueprint, jsonify, request, g
+from sqlalchemy.orm import selectinload
 import os
 
 from backend.src.db.db_init import get_db
@@ -16,19 +17,22 @@ bp = Blueprint("events", __name__, url_prefix="/api/events")
 # Helpers
 
 def parse_date(value: str) -> date:
-    return datetime.fromisoformat(value).date() if isinstance(value, str) else value
+    if not isinstance(value, str):
+        return value
+    # Common "YYYY-MM-DD" shape: build the date directly instead of a throwaway datetime
+    if len(value) == 10 and value[4] == "-" and value[7] == "-":
+        return date.fromisoformat(value)
+    return datetime.fromisoformat(value).date()
 
 
 def parse_time(value: str) -> time:
-    # Accept formats like "14:00" or "14:00:00"
-    if isinstance(value, str) and len(value.split(":")) == 2:
-        value = value + ":00"
-    if isinstance(value, str):
-        try:
-            return time.fromisoformat(value)
-        except ValueError:
-            raise ValueError(f"Invalid time format: '{value}'. Expected HH:MM or HH:MM:SS.")
-    return value
+    # Accept formats like "14:00" or "14:00:00"; time.fromisoformat handles both directly
+    if not isinstance(value, str):
+        return value
+    try:
+        return time.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Invalid time format: '{value}'. Expected HH:MM or HH:MM:SS.")
 
 
 # Routes
@@ -463,9 +467,10 @@ def list_saved_events():
     """Authenticated: list my saved events."""
     db = get_db()
     try:
-        # Join user_events -> events; eager-load related location/organization via to_dict
+        # Join user_events -> events; location/organization are read by to_dict, so load them in one batch each
         saved = (
             db.query(Event)
+            .options(selectinload(Event.location), selectinload(Event.organization))
             .join(UserEvent, UserEvent.event_id == Event.event_id)
             .filter(UserEvent.user_id == g.user_id)
             .order_by(Event.date, Event.start_time)
@@ -6,6 +6,8 @@ Prevents duplicate events from being added to the database.
 from sqlalchemy.orm import Session
 from backend.src.models.models import Event as EventModel
 
+# Upper bound on values per IN list; keeps large batches under SQLite's bound-parameter limit
+IN_CLAUSE_CHUNK_SIZE = 500
 
 def is_duplicate_event(db: Session, title: str) -> bool:
     """
@@ -46,16 +48,42 @@ def get_duplicate_events(db: Session, event_titles: list[str]) -> set[str]:
     if not event_titles:
         return set()
     
-    # Normalize titles
-    normalized_titles = [title.strip() for title in event_titles if title]
+    # Normalize titles; repeated candidates only need to be looked up once
+    normalized_titles = list({title.strip() for title in event_titles if title})
     
-    # Query all existing events with matching titles
-    existing_events = db.query(EventModel.title).filter(
-        EventModel.title.in_(normalized_titles)
-    ).all()
+    # Query existing events with matching titles, one bounded IN list at a time
+    existing_titles = set()
+    for start in range(0, len(normalized_titles), IN_CLAUSE_CHUNK_SIZE):
+        existing_events = db.query(EventModel.title).filter(
+            EventModel.title.in_(normalized_titles[start:start + IN_CLAUSE_CHUNK_SIZE])
+        ).all()
+        existing_titles.update(event.title for event in existing_events)
     
-    # Return set of existing titles
-    return {event.title for event in existing_events}
+    return existing_titles
+
+
+def get_existing_scraped_urls(db: Session, urls: list[str]) -> set[str]:
+    """
+    Batch check which source URLs already belong to a scraped event.
+    
+    Args:
+        db: SQLAlchemy database session
+        urls: List of external URLs to check
+        
+    Returns:
+        Set of URLs already stored on scraped events
+    """
+    urls = list({url for url in urls if url})
+    
+    existing_urls = set()
+    for start in range(0, len(urls), IN_CLAUSE_CHUNK_SIZE):
+        existing_events = db.query(EventModel.external_url).filter(
+            EventModel.is_scraped.is_(True),
+            EventModel.external_url.in_(urls[start:start + IN_CLAUSE_CHUNK_SIZE])
+        ).all()
+        existing_urls.update(event.external_url for event in existing_events)
+    
+    return existing_urls
 
 
 def filter_duplicate_events(db: Session, events: list[dict]) -> list[dict]:
@@ -72,16 +100,13 @@ def filter_duplicate_events(db: Session, events: list[dict]) -> list[dict]:
     if not events:
         return []
     
-    # Extract all titles
-    titles = [event.get("title") for event in events if event.get("title")]
+    # Normalize each title once and keep it paired with its event
+    titled_events = [(event, event["title"].strip()) for event in events if event.get("title")]
     
-    # Get duplicates
-    duplicates = get_duplicate_events(db, titles)
+    # Get duplicates with a single IN query
+    duplicates = get_duplicate_events(db, [title for _, title in titled_events])
     
     # Filter out duplicates
-    unique_events = [
-        event for event in events 
-        if event.get("title") and event.get("title").strip() not in duplicates
-    ]
+    unique_events = [event for event, title in titled_events if title not in duplicates]
     
     return unique_events
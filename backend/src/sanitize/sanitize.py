@@ -7,6 +7,8 @@ from datetime import datetime, timezone
 ALLOWED_ATTRIBUTES = {"a": ["href", "title", "target"]}
 ALLOWED_PROTOCOLS = ["http", "https", "mailto"]
 HTML_TAG_RE = re.compile(r'<[^>]+>')
+# Characters bleach would strip, escape or replace; text without any of them passes through unchanged
+NEEDS_BLEACH_RE = re.compile(r'[<>&\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f]')
 
 def normalize_whitespace(s: str | None) -> str | None:
     if s is None: return None
@@ -22,6 +24,9 @@ def clip(s: str | None, maxlen: int) -> str | None:
 def clean_html(s: str | None) -> str | None:
     if not s: 
         return s
+    # Plain-text descriptions are common; skip the html5lib tokenizer for them
+    if not NEEDS_BLEACH_RE.search(s):
+        return normalize_whitespace(s)
     cleaned_text = bleach.clean(
         text=s,
         tags=[],
@@ -31,12 +36,14 @@ def clean_html(s: str | None) -> str | None:
     return normalize_whitespace(cleaned_text)
 
 
-def is_future_event(start_at: str | None) -> bool:
+def is_future_event(start_at: str | None, now: datetime | None = None) -> bool:
     """
     Checks if the event start date  the current date (in UTC).
     Returns True if the eent is in the future or today; False otherwise.
 
     start_at: must be an ISO 8601 formatted date string. (e.g., "2023-10-15T14:30:00-08:00")
+    now: optional timezone-aware reference time; callers checking many events pass one
+         timestamp instead of reading the clock per event. Defaults to the current time.
     """
 
     if not start_at:
@@ -47,7 +54,7 @@ def is_future_event(start_at: str | None) -> bool:
         event_start = datetime.fromisoformat(start_at)
 
         #Get the current date in UTC for a consistent comparison
-        now_utc = datetime.now(timezone.utc).date()
+        now_utc = (now or datetime.now(timezone.utc)).astimezone(timezone.utc).date()
 
         # Convert the event start time to UTC for a consistent comparison
         if event_start.tzinfo is None:
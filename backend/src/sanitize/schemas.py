@@ -1,4 +1,4 @@
-from pydantic import BaseModel, Field, EmailStr, AnyUrl, field_validator
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, AnyUrl, field_validator, model_validator
 from datetime import datetime, timezone
 import re
 
@@ -7,6 +7,9 @@ import re
 SAFE_TITLE = re.compile(r"^[a-zA-Z0-9\s\-\.,'()&!?:\"“”%+/#]{1,100}$")
 
 class EventCreate(BaseModel):
+    # Write-once DTO: no assignment validation, unknown keys dropped, strings trimmed on input
+    model_config = ConfigDict(extra="ignore", frozen=True, validate_assignment=False, str_strip_whitespace=True)
+
     title: str = Field("", min_length=1, max_length=100)
     description: str = Field("", max_length=1000)
     start_at: datetime
@@ -22,26 +25,19 @@ class EventCreate(BaseModel):
     @field_validator("title")
     @classmethod
     def title_chars(cls, v: str) -> str:
-        # Be permissive: allow most printable punctuation but reject angle brackets
-        if not isinstance(v, str):
-            raise ValueError("Title must be a string")
-        v = v.strip()
-        if not v:
-            raise ValueError("Title must not be empty")
-        if len(v) > 100:
-            raise ValueError("Title too long")
+        # Be permissive: allow most printable punctuation but reject angle brackets.
+        # Type, emptiness and length are already enforced by the field's constraints before this runs.
         if "<" in v or ">" in v:
             raise ValueError("Title contains invalid characters.")
         return v
 
 
-    @field_validator("ends_at")
-    @classmethod
-    def ends_after_start(cls, v: datetime, info):
-        start_at = info.data.get("start_at")
-        if start_at and v <= start_at:
+    @model_validator(mode="after")
+    def ends_after_start(self):
+        # Runs once on the built model, so both datetimes are plain attributes
+        if self.start_at and self.ends_at <= self.start_at:
             raise ValueError("Event end time must be after start time.")
-        return v
+        return self
     
     """
     @field_validator("ends_at")
@@ -1,28 +1,33 @@
 import csv
 import re
-import json
-from datetime import datetime
+import logging
+import multiprocessing
+import os
+from datetime import datetime, timezone
+from functools import partial
 from urllib.parse import urljoin
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import orjson
 import requests
-from bs4 import BeautifulSoup
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
-from pydantic import ValidationError
+from requests.adapters import HTTPAdapter
+from tenacity import RetryError, retry, stop_after_attempt, wait_exponential, retry_if_exception
+from pydantic import TypeAdapter, ValidationError
 import sys
-import pprint
 from pathlib import Path
-from dotenv import load_dotenv
 
-# Load environment variables from env file
-load_dotenv()
+logger = logging.getLogger(__name__)
 
 # Add parent directories to path to allow imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from backend.src.sanitize import sanitize
+# Bound once at import: these run several times per scraped event
+from backend.src.sanitize.sanitize import (
+    normalize_whitespace as _ws,
+    clean_html as _clean_html,
+    clip as _clip,
+    is_future_event as _is_future_event,
+)
 from backend.src.sanitize import schemas
-from backend.src.sanitize.duplicate_check import is_duplicate_event, filter_duplicate_events
-from backend.src.models.models import Event as EventModel, Location as LocationModel
-from backend.src.db.db_init import SessionLocal
 
 """
 Script Example
@@ -65,6 +70,13 @@ Type2
 # --- Configuration ---
 TARGET_URL = "https://calendar.uoregon.edu"
 MAX_PAGES = 10
+FETCH_WORKERS = 3  # pages fetched ahead of the one being parsed; bounds wasted requests past the last page
+PARSE_CHUNK_SIZE = 64 * 1024  # bytes of HTML fed to the pull parser at a time
+PROCESS_POOL_MIN_EVENTS = 32  # below this, pickling events to worker processes costs more than it saves
+JSONLD_SCRIPT_RE = re.compile(
+    rb'<script[^>]+type=["\']?application/ld\+json["\']?[^>]*>(.*?)</script>',
+    re.DOTALL | re.IGNORECASE,
+)
 HEADERS = {
     # It's always best practice to identify your scraper
     "User-Agent": "UOEventScraper/1.0 (Contact: user@example.com)"
@@ -72,263 +84,477 @@ HEADERS = {
 
 # --- Fetching with Retry Logic  ---
 
+# One keep-alive session shared by all fetch threads so each page reuses an open TLS connection
+SESSION = requests.Session()
+SESSION.headers.update(HEADERS)
+SESSION.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS, max_retries=0))
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=FETCH_WORKERS, max_retries=0))
+
+def _is_transient(exc: BaseException) -> bool:
+    """Connection errors, timeouts and 5xx responses are worth retrying; 4xx (e.g. the 404 past the last page) are not."""
+    if isinstance(exc, (requests.ConnectionError, requests.Timeout)):
+        return True
+    if isinstance(exc, requests.HTTPError):
+        return exc.response is not None and exc.response.status_code >= 500
+    return False
+
 @retry(
     stop=stop_after_attempt(5),
     wait=wait_exponential(multiplier=1, min=0.5, max=8),
-    retry=retry_if_exception_type((requests.RequestException,))
+    retry=retry_if_exception(_is_transient)
 )
 
 def fetch_html(url: str) -> str:
     """
     Fetches HTML content from a URL with robust error handling and exponential backoff.
-    Raises an HTTPError for bad status codes (4xx, 5xx).
+    Raises an HTTPError for bad status codes (4xx, 5xx); 4xx responses are raised
+    immediately, transient failures are retried and end in a RetryError.
     """
-    print(f"Fetching URL: {url}")
-    resp = requests.get(url, headers=HEADERS, timeout=10)
+    logger.info("Fetching URL: %s", url)
+    resp = SESSION.get(url, timeout=10)
     resp.raise_for_status()
     return resp.text
 
 
 # --- Parsing Logic (Targeting JSON-LD) ---
 
+def _drain_jsonld(parser) -> list[str]:
+    """Collect JSON-LD script bodies from the parser's pending events, freeing what has been read."""
+    found = []
+    for _, el in parser.read_events():
+        if el.get("type") == "application/ld+json" and el.text:
+            found.append(el.text)
+        el.clear()
+        # Drop everything parsed before this script; it will never be needed again
+        parent = el.getparent()
+        if parent is not None:
+            while el.getprevious() is not None:
+                del parent[0]
+    return found
+
+
+def iter_jsonld_scripts(html: str):
+    """
+    Yields the text of every <script type="application/ld+json"> block in the page.
+    Feeds the HTML to an lxml pull parser in chunks so the full DOM is never kept around.
+    """
+    if not html:
+        return
+    from lxml import etree  # only needed when the regex pass finds nothing
+
+    # tag="script" filters in libxml2, so no Python element proxies are created for other nodes
+    parser = etree.HTMLPullParser(events=("end",), tag="script", recover=True)
+    for offset in range(0, len(html), PARSE_CHUNK_SIZE):
+        parser.feed(html[offset:offset + PARSE_CHUNK_SIZE])
+        yield from _drain_jsonld(parser)
+    parser.close()
+    yield from _drain_jsonld(parser)
+
+
+def find_jsonld_scripts(html: str) -> list[bytes]:
+    """
+    Returns the raw bodies of the page's JSON-LD script blocks.
+    A single regex scan over the bytes covers the machine-generated calendar markup;
+    the lxml pull parser is only used when the regex finds nothing.
+    """
+    scripts = [m.group(1) for m in JSONLD_SCRIPT_RE.finditer(html.encode("utf-8", "ignore"))]
+    if not scripts:
+        scripts = [text.encode("utf-8") for text in iter_jsonld_scripts(html)]
+    return scripts
+
+
 def parse_listing(html: str, base_url: str) -> list[dict]:
-    soup = BeautifulSoup(html, "lxml")
     rows = []
+    rows_append = rows.append
 
-    target_scripts = soup.find_all("script", {"type": "application/ld+json"})
+    target_scripts = find_jsonld_scripts(html)
     
     if not target_scripts:
-        print("Warning: Could not find any script tags with type='application/ld+json'.")
+        logger.warning("Could not find any script tags with type='application/ld+json'.")
 
 
-    for script_tag in target_scripts:
-        script_text = script_tag.string
-        if not script_text:
+    for script_text in target_scripts:
+
+        # Cheap pre-filter: skip BreadcrumbList/WebSite/etc. blobs without parsing them
+        if b'"Event"' not in script_text:
             continue
 
         try:
             # The entire script content is a clean JSON payload
-            data = json.loads(script_text)
-
-            # Normalize data: It can be a single dict or a list of dicts
-            events = []
-            if isinstance(data, list):
-                events.extend(data)
-            elif isinstance(data, dict):
-                events.append(data)
-            
+            data = orjson.loads(script_text)
+
+            # Normalize data: It can be a single dict or a list of dicts.
+            # Iterate a decoded list in place rather than copying it into a second list.
+            events = [data] if isinstance(data, dict) else (data if isinstance(data, list) else [])
+
             for event in events:
-                if isinstance(event, dict) and event.get("@type") == "Event":
-                
-                    # --- Location Variable Initialization ---
-                    loc_name = ""
-                    address = ""
-                    latitude = ""
-                    longitude = "" 
-                
-                    # Extract fields using .get() for safe access
-                    title = event.get("name", "")
-                
-                    
-                    start_at = event.get("startDate", "") 
-                    ends_at = event.get("endDate", "")   
-                
-                    raw_link = event.get("url", "")
-                    website = urljoin(base_url, raw_link) 
-                    description = event.get("description", "")
-                    image = event.get("image", "")
-                
-                    location = event.get("location", {})
-                    if isinstance(location, dict):
-                        loc_name = location.get("name", "")
-                        address = location.get("address", "")
+                if not isinstance(event, dict):
+                    continue
+
+                # Bind dict.get once per event; the loop below does a dozen lookups
+                get = event.get
+                if get("@type") != "Event":
+                    continue
+
+                # --- Location Variable Initialization ---
+                loc_name = ""
+                address = ""
+                latitude = ""
+                longitude = ""
 
-                    geocoordinates = location.get("geo", {})
+                location = get("location") or {}
+                if isinstance(location, dict):
+                    loc_get = location.get
+                    loc_name = loc_get("name", "")
+                    address = loc_get("address", "")
+
+                    geocoordinates = loc_get("geo") or {}
                     if isinstance(geocoordinates, dict):
-                        latitude = geocoordinates.get("latitude", latitude) 
-                        longitude = geocoordinates.get("longitude", longitude)  
-                        
-                    rows.append({
-                        "title": title,
-                        "start_at": start_at,  
-                        "ends_at": ends_at,    
-                        "location": loc_name,
-                        "address": address,
-                        "latitude": latitude,
-                        "longitude": longitude,
-                        "description": description,
-                        "image": image,
-                        "website": website     
-                    })
-                
-        except json.JSONDecodeError:
-            # Silently ignore script tags that fail to parse as JSON
+                        geo_get = geocoordinates.get
+                        latitude = geo_get("latitude", latitude)
+                        longitude = geo_get("longitude", longitude)
+
+                # Feed URLs are almost always absolute already; only resolve the relative ones
+                raw_link = get("url") or ""
+                if not isinstance(raw_link, str):
+                    raw_link = ""
+                website = raw_link if raw_link.startswith(("http://", "https://")) else urljoin(base_url, raw_link)
+
+                rows_append({
+                    "title": get("name", ""),
+                    "start_at": get("startDate", ""),
+                    "ends_at": get("endDate", ""),
+                    "location": loc_name,
+                    "address": address,
+                    "latitude": latitude,
+                    "longitude": longitude,
+                    "description": get("description", ""),
+                    "image": get("image", ""),
+                    "website": website
+                })
+
+        except ValueError:
+            # Silently ignore script tags that fail to parse as JSON (orjson.JSONDecodeError is a ValueError)
             pass
 
-    print(f"\nFinished parsing scripts. Total events found: {len(rows)}")
-    #pprint.pprint(rows)
+    logger.info("Finished parsing scripts. Total events found: %d", len(rows))
     return rows
 
 # --- Sanitization and Validation Logic ---
-def process_and_validate(event_data: dict) -> dict | None:
-    try: 
-        
-        raw_description = event_data.get("description", "")
-        cleaned_description = sanitize.clean_html(raw_description)
-        clipped_description = sanitize.clip(cleaned_description, 1000)
-        final_description = sanitize.normalize_whitespace(clipped_description)
-
-        final_title = sanitize.normalize_whitespace(event_data.get("title", ""))
-
-
-        event_data["description"] = final_description
-
-        start_at = event_data.get("start_at")
-        ends_at = event_data.get("ends_at")
-
-        # If date is given as a bare date string (YYYY-MM-DD), append end-of-day
-        if isinstance(ends_at, str) and len(ends_at) == 10:
-            ends_at = f"{ends_at}T23:59:59-08:00"
-
-        if isinstance(start_at, str) and len(start_at) == 10:
-            start_at = f"{start_at}T00:00:00-08:00"
-
-        if not sanitize.is_future_event(start_at):
-            print(f"Discarding event '{event_data.get('title')}' because it is in the past.")
-            return None
-
-        # Prepare validated input; optional fields should be None when missing/empty
-        validated_input = {
-            "title": final_title,
-            "description": final_description,
-            "start_at": start_at or None,
-            "ends_at": ends_at or None,
-            "website": event_data.get("website") or None,
-            "image": event_data.get("image") or None,
-        }
-
-        # Normalize and attach location-related fields
-        for field in ("location", "address"):
-            raw_value = event_data.get(field)
-            if isinstance(raw_value, str):
-                cleaned = sanitize.normalize_whitespace(raw_value)
-                validated_input[field] = cleaned if cleaned not in (None, "") else None
-            else:
-                validated_input[field] = raw_value if raw_value is not None else None
-
-        # Latitude/longitude: coerce strings to floats, leave None when missing
-        for coord in ("latitude", "longitude"):
-            raw_value = event_data.get(coord)
-            if raw_value is None or raw_value == "":
+
+# Built once: validates a whole page of events in a single pydantic-core call
+_EVENT_LIST_ADAPTER = TypeAdapter(list[schemas.EventCreate])
+
+
+def prepare_input(event_data: dict, now: datetime | None = None) -> dict | None:
+    """
+    Sanitizes and coerces a raw parsed event into EventCreate input.
+    Returns None when the event is in the past relative to `now` (default: current time).
+    May raise ValueError/TypeError on malformed fields.
+    """
+    start_at = event_data.get("start_at")
+    ends_at = event_data.get("ends_at")
+
+    # If date is given as a bare date string (YYYY-MM-DD), append end-of-day
+    if isinstance(ends_at, str) and len(ends_at) == 10:
+        ends_at = f"{ends_at}T23:59:59-08:00"
+
+    if isinstance(start_at, str) and len(start_at) == 10:
+        start_at = f"{start_at}T00:00:00-08:00"
+
+    # Cheap date filter first: past events never reach the HTML cleaner
+    if not _is_future_event(start_at, now):
+        logger.info("Discarding event '%s' because it is in the past.", event_data.get("title"))
+        return None
+
+    raw_description = event_data.get("description", "")
+    cleaned_description = _clean_html(raw_description)
+    clipped_description = _clip(cleaned_description, 1000)
+    final_description = _ws(clipped_description)
+
+    final_title = _ws(event_data.get("title", ""))
+
+
+    event_data["description"] = final_description
+
+    # Prepare validated input; optional fields should be None when missing/empty
+    validated_input = {
+        "title": final_title,
+        "description": final_description,
+        "start_at": start_at or None,
+        "ends_at": ends_at or None,
+        "website": event_data.get("website") or None,
+        "image": event_data.get("image") or None,
+    }
+
+    # Normalize and attach location-related fields
+    for field in ("location", "address"):
+        raw_value = event_data.get(field)
+        if isinstance(raw_value, str):
+            cleaned = _ws(raw_value)
+            validated_input[field] = cleaned if cleaned not in (None, "") else None
+        else:
+            validated_input[field] = raw_value if raw_value is not None else None
+
+    # Latitude/longitude: coerce strings to floats, leave None when missing
+    for coord in ("latitude", "longitude"):
+        raw_value = event_data.get(coord)
+        if raw_value is None or raw_value == "":
+            validated_input[coord] = None
+        elif isinstance(raw_value, (int, float)):
+            validated_input[coord] = float(raw_value)
+        else:
+            try:
+                validated_input[coord] = float(str(raw_value))
+            except (ValueError, TypeError):
                 validated_input[coord] = None
-            elif isinstance(raw_value, (int, float)):
-                validated_input[coord] = float(raw_value)
-            else:
-                try:
-                    validated_input[coord] = float(str(raw_value))
-                except (ValueError, TypeError):
-                    validated_input[coord] = None            
-        
 
-        validated_model = schemas.EventCreate(**validated_input)
-        return validated_model.model_dump()
-    
+    return validated_input
+
+
+def _safe_prepare_input(event_data: dict, now: datetime | None = None) -> dict | None:
+    """prepare_input, but logs and returns None for malformed events (safe to map across a pool)."""
+    try:
+        return prepare_input(event_data, now)
+    except (ValueError, TypeError) as e:
+        logger.warning("Validation failed for event: %s. Error: %s", event_data.get("title"), e)
+        return None
+
+
+_PROCESS_POOL = None
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    # Created on first use so importing the scraper (tests, one-off scripts) never spawns workers.
+    # crawl's fetch threads are running by then, so workers must not be forked from this process.
+    global _PROCESS_POOL
+    if _PROCESS_POOL is None:
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _PROCESS_POOL = ProcessPoolExecutor(max_workers=os.cpu_count(), mp_context=multiprocessing.get_context(method))
+    return _PROCESS_POOL
+
+
+def _validate_one(validated_input: dict) -> dict | None:
+    try:
+        # Construct only to validate; the already-sanitized input dict is what gets inserted
+        schemas.EventCreate(**validated_input)
+        return validated_input
     except (ValidationError, ValueError, TypeError) as e:
-        print(f"Validation failed for event: {event_data.get('title')}. Error: {e}")
+        logger.warning("Validation failed for event: %s. Error: %s", validated_input.get("title"), e)
+        return None
+
+
+def process_and_validate(event_data: dict, now: datetime | None = None) -> dict | None:
+    try:
+        validated_input = prepare_input(event_data, now)
+    except (ValueError, TypeError) as e:
+        logger.warning("Validation failed for event: %s. Error: %s", event_data.get("title"), e)
+        return None
+
+    if validated_input is None:
         return None
+    return _validate_one(validated_input)
+
+
+def validate_page(events_on_page: list[dict], now: datetime | None = None) -> list[dict]:
+    """
+    Sanitizes every event on a page, then validates them as one batch.
+    If any event fails, falls back to validating one by one so the valid ones are kept.
+    """
+    prepare = partial(_safe_prepare_input, now=now)
+    if len(events_on_page) >= PROCESS_POOL_MIN_EVENTS:
+        # Large pages: spread the CPU-bound HTML cleaning across cores
+        prepared_iter = _get_process_pool().map(prepare, events_on_page, chunksize=16)
+    else:
+        prepared_iter = map(prepare, events_on_page)
+    prepared = [validated_input for validated_input in prepared_iter if validated_input is not None]
+
+    if not prepared:
+        return []
+
+    try:
+        _EVENT_LIST_ADAPTER.validate_python(prepared)
+    except (ValidationError, ValueError, TypeError):
+        # Validators can raise TypeError (e.g. comparing naive and aware datetimes), which pydantic does not wrap
+        return [event for event in map(_validate_one, prepared) if event]
+    # Validation passed; skip dumping the models back into dicts we already have
+    return prepared
 
 
 # --- Database Insertion Logic ---
+def _prefetch_locations(db, validated_events: list[dict]) -> dict[tuple, int]:
+    """
+    Loads the locations referenced by a batch with one WHERE ... IN query.
+    Returns {(building_name, address): location_id}, keyed like the lookup in insert_events_to_db.
+    """
+    from sqlalchemy import and_, or_, tuple_
+    from backend.src.models.models import Location as LocationModel
+
+    pairs = {
+        (event_data.get("location") or "Unknown", event_data.get("address"))
+        for event_data in validated_events
+        if event_data.get("location") or event_data.get("address")
+        or (event_data.get("latitude") and event_data.get("longitude"))
+    }
+    if not pairs:
+        return {}
+
+    # NULL never matches inside a tuple IN, so address-less buildings are matched separately
+    with_address = [pair for pair in pairs if pair[1] is not None]
+    without_address = [name for name, address in pairs if address is None]
+    conditions = []
+    if with_address:
+        conditions.append(tuple_(LocationModel.building_name, LocationModel.address).in_(with_address))
+    if without_address:
+        conditions.append(and_(LocationModel.building_name.in_(without_address), LocationModel.address.is_(None)))
+
+    rows = db.query(
+        LocationModel.location_id, LocationModel.building_name, LocationModel.address
+    ).filter(or_(*conditions)).all()
+    return {(building_name, address): location_id for location_id, building_name, address in rows}
+
+
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing 'Z' natively from 3.11 on
+    _parse_iso = datetime.fromisoformat
+else:
+    def _parse_iso(value: str) -> datetime:
+        return datetime.fromisoformat(value[:-1] + '+00:00' if value.endswith('Z') else value)
+
+
 def insert_events_to_db(validated_events: list[dict]) -> tuple[int, int]:
     """
-    Insert validated events into the database.
+    Insert validated events into the database in a single transaction.
+    New locations and events are written with one multi-row INSERT each; if the event
+    INSERT fails it is retried row by row so one bad event does not discard the rest.
     Returns a tuple of (successful_inserts, failed_inserts).
     """
+    # Deferred so importing the scraper (tests, parse-only use) doesn't pull in SQLAlchemy/DB setup
+    from sqlalchemy import insert
+    from backend.src.db.db_init import SessionLocal
+    from backend.src.models.models import Event as EventModel, Location as LocationModel
+    from backend.src.sanitize.duplicate_check import get_duplicate_events, get_existing_scraped_urls
+
     db = SessionLocal()
     success_count = 0
     failure_count = 0
-    skipped_count = 0
+    skipped = []  # titles of events skipped as already stored, reported in one log line
     
     try:
+        # Resolve duplicates and known locations up front instead of querying per event
+        existing_titles = get_duplicate_events(db, [event_data.get("title") for event_data in validated_events])
+        existing_urls = get_existing_scraped_urls(db, [event_data.get("website") for event_data in validated_events])
+        loc_cache = _prefetch_locations(db, validated_events)
+
+        pending = []        # (event row, location key) in input order
+        new_locations = {}  # location key -> row for locations not yet in the database
+        _fromiso = _parse_iso
+
         for event_data in validated_events:
+            # Check if this specific event is a duplicate BEFORE processing
+            event_title = event_data.get("title")
+            if event_title and event_title.strip() in existing_titles:
+                skipped.append(event_title)
+                continue
+            website = event_data.get("website")
+            if website and website in existing_urls:
+                skipped.append(event_title or website)
+                continue
+
             try:
-                # Check if this specific event is a duplicate BEFORE processing
-                event_title = event_data.get("title")
-                if is_duplicate_event(db, event_title):
-                    skipped_count += 1
-                    print(f"Skipped duplicate: {event_title}")
-                    continue
-                
                 # Parse datetime strings to datetime objects
                 start_at = event_data.get("start_at")
                 ends_at = event_data.get("ends_at")
                 
                 if isinstance(start_at, str):
-                    start_at = datetime.fromisoformat(start_at.replace('Z', '+00:00'))
+                    start_at = _fromiso(start_at)
                 if isinstance(ends_at, str):
-                    ends_at = datetime.fromisoformat(ends_at.replace('Z', '+00:00'))
-                
-                # Extract date and time components
-                event_date = start_at.date() if start_at else None
-                start_time = start_at.time() if start_at else None
-                end_time = ends_at.time() if ends_at else None
-                
-                # Handle location data
-                location_id = None
-                location_name = event_data.get("location")
-                address = event_data.get("address")
-                latitude = event_data.get("latitude")
-                longitude = event_data.get("longitude")
-                
-                # Create or find location if we have location data
-                if location_name or address or (latitude and longitude):
-                    # Check if location already exists
-                    existing_location = db.query(LocationModel).filter(
-                        LocationModel.building_name == (location_name or "Unknown"),
-                        LocationModel.address == address
-                    ).first()
-                    
-                    if existing_location:
-                        location_id = existing_location.location_id
-                    else:
-                        # Create new location
-                        new_location = LocationModel(
-                            building_name=location_name or "Unknown",
-                            address=address,
-                            latitude=latitude,
-                            longitude=longitude
-                        )
-                        db.add(new_location)
-                        db.flush()  # Get the location_id without committing
-                        location_id = new_location.location_id
-                
-                # Create Event model instance
-                event = EventModel(
-                    title=event_title,
-                    description=event_data.get("description"),
-                    category="Scraped",  # Default category for scraped events
-                    date=event_date,
-                    start_time=start_time,
-                    end_time=end_time,
-                    image_url=str(event_data.get("image")) if event_data.get("image") else None,
-                    external_url=str(event_data.get("website")) if event_data.get("website") else None,
-                    location_id=location_id,
-                    is_scraped=True
-                )
-                
-                db.add(event)
-                db.commit()
-                success_count += 1
-                print(f"✓ Inserted: {event_title}")
-                
-            except Exception as e:
-                db.rollback()
+                    ends_at = _fromiso(ends_at)
+            except (ValueError, TypeError) as e:
                 failure_count += 1
-                print(f"✗ Failed to insert '{event_data.get('title')}': {e}")
+                logger.warning("✗ Failed to insert '%s': %s", event_title, e)
+                continue
+            
+            # Handle location data
+            location_key = None
+            location_name = event_data.get("location")
+            address = event_data.get("address")
+            latitude = event_data.get("latitude")
+            longitude = event_data.get("longitude")
+            
+            # Create or find location if we have location data
+            if location_name or address or (latitude and longitude):
+                location_key = (location_name or "Unknown", address)
+                if location_key not in loc_cache and location_key not in new_locations:
+                    new_locations[location_key] = {
+                        "building_name": location_key[0],
+                        "address": address,
+                        "latitude": latitude,
+                        "longitude": longitude,
+                    }
+
+            pending.append(({
+                "title": event_title,
+                "description": event_data.get("description"),
+                "category": "Scraped",  # Default category for scraped events
+                "date": start_at.date() if start_at else None,
+                "start_time": start_at.time() if start_at else None,
+                "end_time": ends_at.time() if ends_at else None,
+                "image_url": str(event_data.get("image")) if event_data.get("image") else None,
+                "external_url": str(event_data.get("website")) if event_data.get("website") else None,
+                "is_scraped": True,
+            }, location_key))
+            if event_title:
+                existing_titles.add(event_title.strip())
+            if website:
+                existing_urls.add(website)
+
+        if new_locations:
+            inserted_locations = db.execute(
+                insert(LocationModel).returning(
+                    LocationModel.location_id, LocationModel.building_name, LocationModel.address
+                ),
+                list(new_locations.values()),
+            )
+            for location_id, building_name, address in inserted_locations:
+                loc_cache[(building_name, address)] = location_id
+
+        event_rows = []
+        for row, location_key in pending:
+            row["location_id"] = loc_cache.get(location_key) if location_key else None
+            event_rows.append(row)
+
+        if event_rows:
+            try:
+                with db.begin_nested():
+                    db.execute(insert(EventModel), event_rows)
+                success_count += len(event_rows)
+                logger.info("✓ Inserted %d events", len(event_rows))
+            except Exception:
+                # The multi-row INSERT is all-or-nothing; find the offending rows one at a time
+                for row in event_rows:
+                    try:
+                        with db.begin_nested():
+                            db.execute(insert(EventModel), [row])
+                    except Exception as e:
+                        failure_count += 1
+                        logger.warning("✗ Failed to insert '%s': %s", row["title"], e)
+                        continue
+                    success_count += 1
+                    logger.info("✓ Inserted: %s", row["title"])
+
+        db.commit()
         
         # Print summary if any were skipped
-        if skipped_count > 0:
-            print(f"\nTotal skipped duplicates: {skipped_count}")
+        if skipped:
+            logger.info("Total skipped duplicates: %d (%s)", len(skipped), "; ".join(map(str, skipped)))
+
+    except Exception as e:
+        db.rollback()
+        logger.error("Failed to commit scraped events: %s", e)
+        # Nothing from the batch was committed, so every event not skipped as a duplicate failed
+        failure_count = len(validated_events) - len(skipped)
+        success_count = 0
                 
     finally:
         db.close()
@@ -342,82 +568,93 @@ def insert_events_to_db(validated_events: list[dict]) -> tuple[int, int]:
 # def crawl(url: str, out_csv: str):
 def crawl(url: str):
     
-    #Runs the scraping process: fetches the page, parses the data, 
-    #and writes the results to a CSV file.
+    #Runs the scraping process: fetches each page, parses and validates its events,
+    #and inserts them into the database before moving on to the next page.
     
     base_url = url.rstrip('/')
-    validated_events = []
+    total_validated = 0
+    total_inserted = 0
+    total_failed = 0
+
+    # One reference time for the whole crawl instead of a clock read per event
+    now = datetime.now(timezone.utc)
+    page_urls = [base_url] + [f"{base_url}/calendar/{n}" for n in range(2, MAX_PAGES + 1)]
 
     try:
-        for page_counter in range(1, MAX_PAGES + 1):
-            if page_counter == 1:
-                current_url = base_url
-            else:
-                current_url = f"{base_url}/calendar/{page_counter}"
+        # Fetch pages concurrently (network-bound), but consume results in page order so the
+        # first 404 or empty page still ends the crawl exactly as the sequential version did.
+        # Only FETCH_WORKERS pages are in flight; the next is submitted once a page proves the listing continues.
+        with ThreadPoolExecutor(max_workers=FETCH_WORKERS) as executor:
+            futures = [executor.submit(fetch_html, page_url) for page_url in page_urls[:FETCH_WORKERS]]
+            try:
+                for page_counter, current_url in enumerate(page_urls, start=1):
+                    logger.info("--- Scraping Page %d ---", page_counter)
 
-            print(f"\n--- Scraping Page {page_counter} ---")
+                    try:
+                        html = futures[page_counter - 1].result()
 
-            try:
-                html = fetch_html(current_url)
+                    except requests.exceptions.HTTPError as e:
+                        if e.response.status_code == 404:
+                            logger.info("Page %d returned 404. Ending crawl.", page_counter)
+                            break
 
-            except requests.exceptions.HTTPError as e:
-                if e.response.status_code == 404:
-                    print(f"Page{page_counter} returned 404. Ending crawl.")
-                    break
+                        else:
+                            raise e
+                        
+                    events_on_page = parse_listing(html, base_url=current_url)
 
-                else:
-                    raise e
-                
-            events_on_page = parse_listing(html, base_url=current_url)
+                    if not events_on_page:
+                        logger.info("Page %d returned no events. Ending crawl.", page_counter)
+                        break
 
-            if not events_on_page:
-                print(f"Page {page_counter} returned no events. Ending crawl.")
-                break
+                    if len(futures) < len(page_urls):
+                        futures.append(executor.submit(fetch_html, page_urls[len(futures)]))
 
-            for raw_event in events_on_page:
-                validated_event = process_and_validate(raw_event)
-                if validated_event:
-                    validated_events.append(validated_event)
+                    page_events = validate_page(events_on_page, now)
 
-            print(f"-> Validated {len(validated_events)} events on this page.")
-            
+                    logger.info("-> Validated %d events on this page.", len(page_events))
+                    if not page_events:
+                        continue
+
+                    # Write each page as soon as it is validated so memory stays bounded by page size
+                    success_count, failure_count = insert_events_to_db(page_events)
+                    total_validated += len(page_events)
+                    total_inserted += success_count
+                    total_failed += failure_count
+            finally:
+                # Pages past the stopping point are not needed
+                for future in futures:
+                    future.cancel()
 
         if page_counter >= MAX_PAGES:
-            print(f"Found {len(validated_events)} events on this page. Total: {len(validated_events)}")
+            logger.info("Reached MAX_PAGES. Total validated events: %d", total_validated)
 
-    except requests.RequestException as e:
-            print(f"FATAL ERROR: Failed to fetch URL or connect to site. Stopping crawl: {e}")
+    except (requests.RequestException, RetryError) as e:
+            logger.error("Failed to fetch URL or connect to site. Stopping crawl: %s", e)
     except Exception as e:
-            print(f"An unexpected error occurred during crawl: {e}")
+            logger.exception("An unexpected error occurred during crawl: %s", e)
 
     
-    if not validated_events:
-        print("No events were extracted during the entire crawl.")
+    if not total_validated:
+        logger.warning("No events were extracted during the entire crawl.")
         return
     
-    print(f"\n=== Inserting {len(validated_events)} events into database ===")
-    success_count, failure_count = insert_events_to_db(validated_events)
-    
-    print(f"\nSuccessfully inserted: {success_count} events")
-    print(f"Failed to insert: {failure_count} events")
-    print(f"Total processed: {len(validated_events)} events")
+    logger.info("Successfully inserted: %d events", total_inserted)
+    logger.info("Failed to insert: %d events", total_failed)
+    logger.info("Total processed: %d events", total_validated)
     
     
 
 
 if __name__ == "__main__":
+    from dotenv import load_dotenv
+
+    # Load environment variables from env file (before db_init reads DATABASE_URL)
+    load_dotenv()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     #crawl(TARGET_URL, OUTPUT_FILE) 
     crawl(TARGET_URL)
 
-    """
-    html = fetch_html(TARGET_URL)
-    events = parse_listing(html, base_url=TARGET_URL)
-    for raw_event in events:
-                validated_event = process_and_validate(raw_event)
-                if validated_event:
-                    pprint.pprint(validated_event)
-    """
-
 
      
     
\ No newline at end of file
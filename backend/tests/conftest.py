@@ -1,14 +1,17 @@
 import os
 import sys
 import pathlib
-import tempfile
 import pytest
 
 
 #Used to configure testing environment
-# Set env early so db_init uses sqlite and doesn't try to import psycopg2
-_tmp_db = os.path.join(tempfile.gettempdir(), "ducks_test.db")
-os.environ["DATABASE_URL"] = f"sqlite:///{_tmp_db}"
+# Set env early so db_init uses sqlite and doesn't try to import psycopg2.
+# Tests default to an in-memory SQLite database (private to each pytest-xdist worker process);
+# set TEST_DATABASE_URL to run them against another database. A "{worker}" placeholder in it is
+# replaced with the xdist worker id (gw0, gw1, ...) so parallel workers don't share a schema.
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", "sqlite:///:memory:").replace(
+    "{worker}", os.getenv("PYTEST_XDIST_WORKER", "main")
+)
 os.environ.setdefault("SUPABASE_JWT_SECRET", "testsecret")
 
 # Ensure package imports resolve from repo root
@@ -16,20 +19,72 @@ ROOT = pathlib.Path(__file__).resolve().parents[2]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
+from sqlalchemy import event
 from backend.src.db.db_init import Base, engine
+
+
+if engine.dialect.name == "sqlite" and engine.url.database not in (None, "", ":memory:"):
+    # File-backed test database (TEST_DATABASE_URL): test data is disposable, so skip fsyncs
+    @event.listens_for(engine, "connect")
+    def _disable_sqlite_sync(dbapi_connection, _connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.close()
+
+# Imported after the listener above: importing the app module already opens a pooled connection
 from backend.src.app import create_app
 
 
-@pytest.fixture(scope="session")
-def app():
-    # Create tables using ORM metadata (sufficient for tests)
+@pytest.fixture(scope="session", autouse=True)
+def schema():
+    # Create tables using ORM metadata (sufficient for tests); an in-memory database starts empty
+    from backend.src.models import models  # noqa: F401  (registers the tables on Base)
     Base.metadata.create_all(bind=engine)
 
+
+@pytest.fixture(scope="session")
+def app():
     app = create_app()
     app.config.update(TESTING=True)
     return app
 
 
-@pytest.fixture()
+# Users the API tests authenticate as: name -> (user_id, email, role)
+SEEDED_USERS = {
+    "coordinator": ("00000000-0000-0000-0000-000000000001", "test@uoregon.edu", "coordinator"),
+    "me_check": ("00000000-0000-0000-0000-000000000009", "me-check@uoregon.edu", "coordinator"),
+    "pager": ("00000000-0000-0000-0000-000000000010", "pager@uoregon.edu", "coordinator"),
+    "owner": ("00000000-0000-0000-0000-000000000011", "owner@uoregon.edu", "coordinator"),
+    "other": ("00000000-0000-0000-0000-000000000012", "other@uoregon.edu", "coordinator"),
+    "creator": ("00000000-0000-0000-0000-000000000021", "creator@uoregon.edu", "coordinator"),
+    "admin": ("00000000-0000-0000-0000-000000000022", "admin@uoregon.edu", "admin"),
+}
+
+
+@pytest.fixture(scope="session")
 def client(app):
+    # The test client holds no state the tests rely on, so one instance serves the whole run
     return app.test_client()
+
+
+@pytest.fixture(scope="session")
+def seeded_users(app):
+    """Insert the SEEDED_USERS rows that don't exist yet, once per test session."""
+    from backend.src.db.db_init import SessionLocal
+    from backend.src.models.models import User
+
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+
+    rows = [{"user_id": uid, "email": email, "role": role} for uid, email, role in SEEDED_USERS.values()]
+    db = SessionLocal()
+    try:
+        # One idempotent statement; safe when the users already exist or another worker seeds concurrently
+        db.execute(insert(User).values(rows).on_conflict_do_nothing(index_elements=["user_id"]))
+        db.commit()
+    finally:
+        db.close()
+    return SEEDED_USERS
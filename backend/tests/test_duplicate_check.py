@@ -4,47 +4,77 @@ Tests event duplicate detection and filtering logic.
 """
 
 import pytest
-from datetime import date, time
+from datetime import date, time, timedelta
 from backend.src.sanitize.duplicate_check import (
     is_duplicate_event,
     get_duplicate_events,
+    get_existing_scraped_urls,
     filter_duplicate_events
 )
+from sqlalchemy.orm import Session
 from backend.src.models.models import Event, Location
-from backend.src.db.db_init import SessionLocal
+from backend.src.db.db_init import engine
+
+
+@pytest.fixture(scope="class")
+def db_connection():
+    """Open one connection per test class inside a transaction that is rolled back afterwards."""
+    connection = engine.connect()
+    trans = connection.begin()
+    if connection.dialect.name == "sqlite":
+        # pysqlite defers BEGIN until the first DML, so a bare SAVEPOINT would open (and its
+        # RELEASE commit) the outer transaction; start it explicitly so the rollback covers everything
+        connection.exec_driver_sql("BEGIN")
+    yield connection
+    trans.rollback()
+    connection.close()
 
 
 @pytest.fixture
-def db_session():
-    """Create a fresh database session for each test."""
-    session = SessionLocal()
+def db_session(db_connection):
+    """Create a database session whose work is rolled back after each test.
+
+    Rows seeded by the class-scoped fixtures below stay visible to every test in the class.
+    """
+    savepoint = db_connection.begin_nested()
+    # Tests only flush (Core INSERTs run immediately); a commit() would just release a SAVEPOINT
+    session = Session(bind=db_connection, join_transaction_mode="create_savepoint")
     yield session
-    # Cleanup after test
-    session.query(Event).delete()
-    session.query(Location).delete()
-    session.commit()
     session.close()
+    savepoint.rollback()
 
 
-@pytest.fixture
-def sample_location(db_session):
-    """Create a sample location for testing."""
-    location = Location(
+def _seed(db_connection, obj):
+    """Persist obj in the class-level transaction and return it with its attributes loaded.
+
+    commit() here only releases the seeding session's SAVEPOINT (no fsync); it is needed so the
+    row outlives this short-lived session, and expire_on_commit=False avoids a reload SELECT.
+    """
+    session = Session(bind=db_connection, join_transaction_mode="create_savepoint", expire_on_commit=False)
+    try:
+        session.add(obj)
+        session.commit()
+    finally:
+        session.close()
+    return obj
+
+
+@pytest.fixture(scope="class")
+def sample_location(db_connection):
+    """Create a sample location once per test class."""
+    return _seed(db_connection, Location(
         building_name="Test Hall",
         room_number="101",
         address="123 Test St",
         latitude=44.0,
         longitude=-123.0
-    )
-    db_session.add(location)
-    db_session.commit()
-    return location
+    ))
 
 
-@pytest.fixture
-def sample_event(db_session, sample_location):
-    """Create a sample event for testing."""
-    event = Event(
+@pytest.fixture(scope="class")
+def sample_event(db_connection, sample_location):
+    """Create a sample event once per test class."""
+    return _seed(db_connection, Event(
         title="Test Event",
         description="A test event",
         category="test",
@@ -53,10 +83,7 @@ def sample_event(db_session, sample_location):
         end_time=time(11, 0),
         location_id=sample_location.location_id,
         is_scraped=True
-    )
-    db_session.add(event)
-    db_session.commit()
-    return event
+    ))
 
 
 class TestIsDuplicateEvent:
@@ -94,21 +121,18 @@ class TestGetDuplicateEvents:
 
     def test_find_multiple_duplicates(self, db_session, sample_location):
         """Test finding multiple duplicate events."""
-        # Create multiple events
-        events = [
-            Event(title="Event A", description="", category="test", 
-                  date=date(2025, 12, 15), start_time=time(10, 0), 
-                  end_time=time(11, 0), location_id=sample_location.location_id),
-            Event(title="Event B", description="", category="test",
-                  date=date(2025, 12, 16), start_time=time(10, 0),
-                  end_time=time(11, 0), location_id=sample_location.location_id),
-            Event(title="Event C", description="", category="test",
-                  date=date(2025, 12, 17), start_time=time(10, 0),
-                  end_time=time(11, 0), location_id=sample_location.location_id)
-        ]
-        for event in events:
-            db_session.add(event)
-        db_session.commit()
+        # Create multiple events in one multi-row INSERT
+        db_session.execute(Event.__table__.insert(), [
+            dict(title="Event A", description="", category="test",
+                 date=date(2025, 12, 15), start_time=time(10, 0),
+                 end_time=time(11, 0), location_id=sample_location.location_id),
+            dict(title="Event B", description="", category="test",
+                 date=date(2025, 12, 16), start_time=time(10, 0),
+                 end_time=time(11, 0), location_id=sample_location.location_id),
+            dict(title="Event C", description="", category="test",
+                 date=date(2025, 12, 17), start_time=time(10, 0),
+                 end_time=time(11, 0), location_id=sample_location.location_id)
+        ])
 
         # Check which titles are duplicates
         titles_to_check = ["Event A", "Event B", "Event D", "Event E"]
@@ -136,6 +160,51 @@ class TestGetDuplicateEvents:
         assert "Test Event" in duplicates
 
 
+    def test_large_candidate_list(self, db_session):
+        """Test that candidate lists longer than one IN chunk are fully checked."""
+        event_date = date.today() + timedelta(days=7)
+        db_session.execute(Event.__table__.insert(), [
+            dict(title=f"Bulk Event {i}", description="", category="test",
+                 date=event_date, start_time=time(10, 0), end_time=time(11, 0))
+            for i in (0, 700, 1199)
+        ])
+
+        titles = [f"Bulk Event {i}" for i in range(1200)] + ["Bulk Event 0"]
+        duplicates = get_duplicate_events(db_session, titles)
+        assert duplicates == {"Bulk Event 0", "Bulk Event 700", "Bulk Event 1199"}
+
+
+class TestGetExistingScrapedUrls:
+    """Test cases for get_existing_scraped_urls function."""
+
+    def test_only_scraped_urls_match(self, db_session, sample_location):
+        """Test that URLs on scraped events are found and manual events are ignored."""
+        event_date = date.today() + timedelta(days=7)
+        db_session.execute(Event.__table__.insert(), [
+            dict(title=title, description="", category="test",
+                 date=event_date, start_time=time(10, 0), end_time=time(11, 0),
+                 location_id=sample_location.location_id,
+                 external_url=url, is_scraped=scraped)
+            for title, url, scraped in [
+                ("Scraped Event", "https://calendar.uoregon.edu/event/1", True),
+                ("Manual Event", "https://calendar.uoregon.edu/event/2", False),
+            ]
+        ])
+
+        found = get_existing_scraped_urls(db_session, [
+            "https://calendar.uoregon.edu/event/1",
+            "https://calendar.uoregon.edu/event/2",
+            "https://calendar.uoregon.edu/event/3",
+            None,
+        ])
+        assert found == {"https://calendar.uoregon.edu/event/1"}
+
+    def test_empty_list(self, db_session):
+        """Test that empty input returns an empty set."""
+        assert get_existing_scraped_urls(db_session, []) == set()
+        assert get_existing_scraped_urls(db_session, [None, ""]) == set()
+
+
 class TestFilterDuplicateEvents:
     """Test cases for filter_duplicate_events function."""
 
@@ -152,7 +221,7 @@ class TestFilterDuplicateEvents:
             location_id=sample_location.location_id
         )
         db_session.add(existing)
-        db_session.commit()
+        db_session.flush()
 
         # List of events to filter
         events = [
@@ -223,17 +292,14 @@ class TestIntegrationScenarios:
     def test_complete_workflow(self, db_session, sample_location):
         """Test complete duplicate detection workflow."""
         # Step 1: Create some existing events
-        existing_events = [
-            Event(title="Workshop A", description="", category="workshop",
-                  date=date(2025, 12, 15), start_time=time(10, 0),
-                  end_time=time(11, 0), location_id=sample_location.location_id),
-            Event(title="Seminar B", description="", category="seminar",
-                  date=date(2025, 12, 16), start_time=time(14, 0),
-                  end_time=time(15, 0), location_id=sample_location.location_id)
-        ]
-        for event in existing_events:
-            db_session.add(event)
-        db_session.commit()
+        db_session.execute(Event.__table__.insert(), [
+            dict(title="Workshop A", description="", category="workshop",
+                 date=date(2025, 12, 15), start_time=time(10, 0),
+                 end_time=time(11, 0), location_id=sample_location.location_id),
+            dict(title="Seminar B", description="", category="seminar",
+                 date=date(2025, 12, 16), start_time=time(14, 0),
+                 end_time=time(15, 0), location_id=sample_location.location_id)
+        ])
 
         # Step 2: Prepare new events (some duplicates, some unique)
         new_events = [
@@ -256,9 +322,9 @@ class TestIntegrationScenarios:
 
     def test_batch_duplicate_check(self, db_session, sample_location):
         """Test batch checking for duplicates is more efficient."""
-        # Create 10 existing events
-        for i in range(10):
-            event = Event(
+        # Create 10 existing events with a single INSERT
+        db_session.execute(Event.__table__.insert(), [
+            dict(
                 title=f"Event {i}",
                 description="",
                 category="test",
@@ -267,8 +333,8 @@ class TestIntegrationScenarios:
                 end_time=time(11, 0),
                 location_id=sample_location.location_id
             )
-            db_session.add(event)
-        db_session.commit()
+            for i in range(10)
+        ])
 
         # Check which of 20 events are duplicates
         titles_to_check = [f"Event {i}" for i in range(20)]
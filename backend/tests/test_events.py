@@ -1,9 +1,17 @@
 import os
-from datetime import date, timedelta
+from datetime import date, timedelta, time as _t
+from functools import lru_cache
 
 import jwt
+import pytest
 
+from backend.src.auth import jwt as auth_jwt
+from backend.src.db.db_init import SessionLocal
+from backend.src.models.models import Event
 
+
+# Payloads carry no exp, so a signed token stays valid for the whole session
+@lru_cache(maxsize=64)
 def make_token(sub: str, email: str) -> str:
     secret = os.environ["SUPABASE_JWT_SECRET"]
     payload = {
@@ -13,12 +21,31 @@ def make_token(sub: str, email: str) -> str:
     return jwt.encode(payload, secret, algorithm="HS256")
 
 
+def auth_headers(sub: str, email: str) -> dict:
+    """Test-only auth headers (honored while app.config["TESTING"] is set); skips JWT signing and verification."""
+    return {"X-Test-Sub": sub, "X-Test-Email": email}
+
+
 def test_health(client):
     resp = client.get("/health")
     assert resp.status_code == 200
     assert resp.get_json()["status"] == "ok"
 
 
+def test_cached_token_still_expires(monkeypatch):
+    """A token verified (and cached) while valid must be rejected once its exp passes."""
+    exp = 2_000_000_000
+    token = jwt.encode(
+        {"sub": "00000000-0000-0000-0000-000000000031", "exp": exp},
+        os.environ["SUPABASE_JWT_SECRET"],
+        algorithm="HS256",
+    )
+    assert auth_jwt.decode_token(token)["sub"] == "00000000-0000-0000-0000-000000000031"
+    monkeypatch.setattr(auth_jwt.time, "time", lambda: exp + 1)
+    with pytest.raises(jwt.ExpiredSignatureError):
+        auth_jwt.decode_token(token)
+
+
 def test_create_requires_auth(client):
     # Minimal body, should be unauthorized without token
     body = {
@@ -32,20 +59,18 @@ def test_create_requires_auth(client):
     assert resp.status_code == 401
 
 
-def test_create_and_save_flow(client):
-    # Seed coordinator role explicitly (no self-assign via token) before making requests.
-    from backend.src.db.db_init import SessionLocal
-    from backend.src.models.models import User
-    user_id = "00000000-0000-0000-0000-000000000001"
-    db = SessionLocal()
-    try:
-        if not db.query(User).filter(User.user_id == user_id).first():
-            db.add(User(user_id=user_id, email="test@uoregon.edu", role="coordinator"))
-            db.commit()
-    finally:
-        db.close()
-    token = make_token(user_id, "test@uoregon.edu")
-    headers = {"Authorization": f"Bearer {token}"}
+def test_x_test_headers_ignored_outside_testing(app, client, seeded_users, monkeypatch):
+    """X-Test-Sub must not authenticate anyone unless the app is in TESTING mode."""
+    user_id, email, _ = seeded_users["me_check"]
+    monkeypatch.setitem(app.config, "TESTING", False)
+    resp = client.get("/api/users/me", headers=auth_headers(user_id, email))
+    assert resp.status_code == 401
+
+
+def test_create_and_save_flow(client, seeded_users):
+    # Coordinator role is seeded explicitly (no self-assign via token) before making requests.
+    user_id, email, _ = seeded_users["coordinator"]
+    headers = auth_headers(user_id, email)
 
     # Create an event
     body = {
@@ -84,20 +109,13 @@ def test_create_and_save_flow(client):
     assert all(e["event_id"] != event_id for e in saved)
 
 
-def test_me_returns_seeded_role(client):
-    """Ensure /api/users/me reflects the role we manually seeded (coordinator)."""
-    from backend.src.db.db_init import SessionLocal
-    from backend.src.models.models import User
-    user_id = "00000000-0000-0000-0000-000000000009"
-    db = SessionLocal()
-    try:
-        existing = db.query(User).filter(User.user_id == user_id).first()
-        if not existing:
-            db.add(User(user_id=user_id, email="me-check@uoregon.edu", role="coordinator"))
-            db.commit()
-    finally:
-        db.close()
-    token = make_token(user_id, "me-check@uoregon.edu")
+def test_me_returns_seeded_role(client, seeded_users):
+    """Ensure /api/users/me reflects the role we manually seeded (coordinator).
+
+    Authenticates with a real signed JWT so the bearer-token path stays covered.
+    """
+    user_id, email, _ = seeded_users["me_check"]
+    token = make_token(user_id, email)
     headers = {"Authorization": f"Bearer {token}"}
     resp = client.get("/api/users/me", headers=headers)
     assert resp.status_code == 200, resp.get_data(as_text=True)
@@ -107,37 +125,32 @@ def test_me_returns_seeded_role(client):
     assert body["email"] == "me-check@uoregon.edu"
 
 
-def test_events_pagination_and_search(client):
+def test_events_pagination_and_search(client, seeded_users):
     """Create multiple events and verify pagination + search filtering works."""
-    from backend.src.db.db_init import SessionLocal
-    from backend.src.models.models import User, Event
+    user_id, email, _ = seeded_users["pager"]
     db = SessionLocal()
-    user_id = "00000000-0000-0000-0000-000000000010"
     try:
-        if not db.query(User).filter(User.user_id == user_id).first():
-            db.add(User(user_id=user_id, email="pager@uoregon.edu", role="coordinator"))
-            db.commit()
         # Bulk create 25 events
         existing_count = db.query(Event).count()
         to_create = max(0, 25 - existing_count)
-        from datetime import date, timedelta, time as _t
-        for i in range(to_create):
-            ev = Event(
-                title=f"Pagination Event {i}",
-                category="test",
-                date=date.today() + timedelta(days=i+1),
-                start_time=_t(10, 0),
-                end_time=_t(11, 0),
-                created_by=user_id,
-                is_scraped=False,
-            )
-            db.add(ev)
         if to_create:
+            # One multi-row INSERT; the rows are never read back as Event instances
+            db.execute(Event.__table__.insert(), [
+                {
+                    "title": f"Pagination Event {i}",
+                    "category": "test",
+                    "date": date.today() + timedelta(days=i+1),
+                    "start_time": _t(10, 0),
+                    "end_time": _t(11, 0),
+                    "created_by": user_id,
+                    "is_scraped": False,
+                }
+                for i in range(to_create)
+            ])
             db.commit()
     finally:
         db.close()
-    token = make_token(user_id, "pager@uoregon.edu")
-    headers = {"Authorization": f"Bearer {token}"}
+    headers = auth_headers(user_id, email)
     # Page 2 with page_size=10 should return items 11-20 (IDs may not be contiguous, so verify count & meta)
     r = client.get("/api/events/?page=2&page_size=10", headers=headers)
     assert r.status_code == 200, r.get_data(as_text=True)
@@ -155,20 +168,13 @@ def test_events_pagination_and_search(client):
     assert any("Pagination Event 1" in e["title"] for e in body2["items"])
 
 
-def test_event_update_flow(client):
+def test_event_update_flow(client, seeded_users):
     """Owner can update an event, non-owner forbidden."""
-    from backend.src.db.db_init import SessionLocal
-    from backend.src.models.models import User, Event
-    owner_id = "00000000-0000-0000-0000-000000000011"
-    other_id = "00000000-0000-0000-0000-000000000012"
+    owner_id, owner_email, _ = seeded_users["owner"]
+    other_id, other_email, _ = seeded_users["other"]
     db = SessionLocal()
     try:
-        for uid, email in [(owner_id, "owner@uoregon.edu"), (other_id, "other@uoregon.edu")]:
-            if not db.query(User).filter(User.user_id == uid).first():
-                db.add(User(user_id=uid, email=email, role="coordinator"))
-        db.commit()
         # Create event by owner
-        from datetime import date, timedelta, time as _t
         ev = Event(
             title="Update Target",
             category="update",
@@ -179,14 +185,13 @@ def test_event_update_flow(client):
             is_scraped=False,
         )
         db.add(ev)
-        db.commit()
+        db.flush()  # assigns event_id; reading it after commit() would cost a reload SELECT
         event_id = ev.event_id
+        db.commit()
     finally:
         db.close()
-    owner_token = make_token(owner_id, "owner@uoregon.edu")
-    other_token = make_token(other_id, "other@uoregon.edu")
-    owner_headers = {"Authorization": f"Bearer {owner_token}"}
-    other_headers = {"Authorization": f"Bearer {other_token}"}
+    owner_headers = auth_headers(owner_id, owner_email)
+    other_headers = auth_headers(other_id, other_email)
     # Owner updates
     r = client.patch(f"/api/events/{event_id}", json={"title": "Updated Title"}, headers=owner_headers)
     assert r.status_code == 200, r.get_data(as_text=True)
@@ -196,24 +201,13 @@ def test_event_update_flow(client):
     assert r2.status_code == 403
 
 
-def test_admin_can_update_others_event(client):
+def test_admin_can_update_others_event(client, seeded_users):
     """Admin should be able to patch an event they did not create."""
-    from backend.src.db.db_init import SessionLocal
-    from backend.src.models.models import User, Event
-    creator_id = "00000000-0000-0000-0000-000000000021"
-    admin_id = "00000000-0000-0000-0000-000000000022"
+    creator_id, _, _ = seeded_users["creator"]
+    admin_id, admin_email, _ = seeded_users["admin"]
     db = SessionLocal()
     try:
-        # Seed creator (coordinator) and admin
-        for uid, email, role in [
-            (creator_id, "creator@uoregon.edu", "coordinator"),
-            (admin_id, "admin@uoregon.edu", "admin"),
-        ]:
-            if not db.query(User).filter(User.user_id == uid).first():
-                db.add(User(user_id=uid, email=email, role=role))
-        db.commit()
         # Create event owned by creator
-        from datetime import date, timedelta, time as _t
         ev = Event(
             title="Admin Update Target",
             category="admin-test",
@@ -224,12 +218,12 @@ def test_admin_can_update_others_event(client):
             is_scraped=False,
         )
         db.add(ev)
-        db.commit()
+        db.flush()  # assigns event_id; reading it after commit() would cost a reload SELECT
         event_id = ev.event_id
+        db.commit()
     finally:
         db.close()
-    admin_token = make_token(admin_id, "admin@uoregon.edu")
-    admin_headers = {"Authorization": f"Bearer {admin_token}"}
+    admin_headers = auth_headers(admin_id, admin_email)
     r = client.patch(f"/api/events/{event_id}", json={"title": "Admin Updated"}, headers=admin_headers)
     assert r.status_code == 200, r.get_data(as_text=True)
     assert r.get_json()["title"] == "Admin Updated"
@@ -1,5 +1,6 @@
 import pytest
-from backend.src.sanitize.sanitize import normalize_whitespace, clean_html, clip
+from datetime import datetime, timezone
+from backend.src.sanitize.sanitize import normalize_whitespace, clean_html, clip, is_future_event
 
 def test_normalize_whitespace_trims_and_collapses():
     """Tests trimming of ends and collapsing of internal spaces/tabs."""
@@ -28,4 +29,10 @@ def test_clip_does_not_truncate_short_string():
     """Tests that a short string is returned untouched."""
     short_str = "Short"
     max_len = 100
-    assert clip(short_str, max_len) == short_str
\ No newline at end of file
+    assert clip(short_str, max_len) == short_str
+
+def test_is_future_event_uses_supplied_now():
+    """Tests that a caller-supplied reference time replaces the clock."""
+    now = datetime(2030, 6, 1, 12, 0, tzinfo=timezone.utc)
+    assert is_future_event("2030-06-01T08:00:00-08:00", now=now)
+    assert not is_future_event("2030-05-31T10:00:00-08:00", now=now)
@@ -5,10 +5,19 @@ from pydantic import ValidationError
 from tenacity import RetryError
 import requests
 from unittest.mock import patch, MagicMock
-from backend.src.scraper.scraper import fetch_html, parse_listing, process_and_validate
+from datetime import datetime, timedelta, timezone
+from backend.src.scraper import scraper
+from backend.src.scraper.scraper import (
+    crawl, fetch_html, insert_events_to_db, parse_listing, process_and_validate, validate_page
+)
 
 # --- Fixtures and Mocks ---
 
+@pytest.fixture(autouse=True)
+def no_retry_backoff(monkeypatch):
+    """Skip tenacity's exponential backoff so retry tests check the logic, not the delay."""
+    monkeypatch.setattr(fetch_html.retry, "sleep", lambda seconds: None)
+
 # Mock HTML containing valid JSON-LD structure
 MOCK_HTML = """
 <html>
@@ -55,7 +64,7 @@ MOCK_EVENT_DATA = {
 
 # --- Tests for fetch_html ---
 
-@patch('requests.get')
+@patch('backend.src.scraper.scraper.SESSION.get')
 def test_fetch_html_success(mock_get):
     """Test successful fetching."""
     mock_response = MagicMock()
@@ -67,7 +76,7 @@ def test_fetch_html_success(mock_get):
     assert html == MOCK_HTML
     mock_response.raise_for_status.assert_called_once()
 
-@patch('requests.get')
+@patch('backend.src.scraper.scraper.SESSION.get')
 def test_fetch_html_retries_on_connection_error(mock_get):
     """Test that tenacity decorator retries on connection error."""
     
@@ -89,6 +98,29 @@ def test_fetch_html_retries_on_connection_error(mock_get):
     
     assert mock_get.call_count == 5
 
+def _response(status_code: int, text: str = "", url: str = "http://test.com") -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status_code
+    resp.url = url
+    resp._content = text.encode("utf-8")
+    resp.encoding = "utf-8"
+    return resp
+
+@patch('backend.src.scraper.scraper.SESSION.get')
+def test_fetch_html_does_not_retry_404(mock_get):
+    """A 404 is final: it is raised as an HTTPError after a single request."""
+    mock_get.return_value = _response(404)
+    with pytest.raises(requests.exceptions.HTTPError):
+        fetch_html("http://test.com/calendar/2")
+    assert mock_get.call_count == 1
+
+@patch('backend.src.scraper.scraper.SESSION.get')
+def test_fetch_html_retries_5xx(mock_get):
+    """Server errors are transient and retried."""
+    mock_get.side_effect = [_response(503), _response(200, MOCK_HTML)]
+    assert fetch_html("http://test.com") == MOCK_HTML
+    assert mock_get.call_count == 2
+
 # --- Tests for parse_listing ---
 
 def test_parse_listing_extracts_all_fields():
@@ -107,6 +139,15 @@ def test_parse_listing_extracts_all_fields():
     # Check URL joining
     assert event['website'] == 'http://uoregon.edu/details/123'
 
+def test_parse_listing_null_url_falls_back_to_base():
+    """A JSON-LD event with a null or non-string url links to the listing page instead of failing."""
+    html = MOCK_HTML.replace('"url": "/details/123"', '"url": null')
+    events = parse_listing(html, "http://uoregon.edu")
+    assert events[0]['website'] == 'http://uoregon.edu'
+    html = MOCK_HTML.replace('"url": "/details/123"', '"url": 123')
+    events = parse_listing(html, "http://uoregon.edu")
+    assert events[0]['website'] == 'http://uoregon.edu'
+
 def test_parse_listing_no_scripts():
     """Test graceful handling when no JSON-LD script tags are found."""
     events = parse_listing("<html><body>No scripts.</body></html>", "http://test.com")
@@ -115,9 +156,9 @@ def test_parse_listing_no_scripts():
 # --- Tests for process_and_validate (Integration) ---
 
 @patch('backend.src.sanitize.schemas.EventCreate')
-@patch('backend.src.sanitize.sanitize.clip', side_effect=lambda x, y: x) # Mock clip to pass data through
-@patch('backend.src.sanitize.sanitize.clean_html', side_effect=lambda x: x.replace('<p>', '').replace('</p>', '')) # Mock clean_html
-@patch('backend.src.sanitize.sanitize.normalize_whitespace', side_effect=lambda x: x.strip()) # Mock normalize_whitespace
+@patch('backend.src.scraper.scraper._clip', side_effect=lambda x, y: x) # Mock clip to pass data through
+@patch('backend.src.scraper.scraper._clean_html', side_effect=lambda x: x.replace('<p>', '').replace('</p>', '')) # Mock clean_html
+@patch('backend.src.scraper.scraper._ws', side_effect=lambda x: x.strip()) # Mock normalize_whitespace
 def test_process_and_validate_success(mock_normalize, mock_clean, mock_clip, MockEventCreate):
     """Test successful data processing through sanitization and Pydantic mock."""
     result = process_and_validate(MOCK_EVENT_DATA)
@@ -137,4 +178,99 @@ def test_process_and_validate_failure(MockEventCreate):
     """Test that validation failure is caught and returns None."""
     # Ensure the failure is handled and returns None
     result = process_and_validate(MOCK_EVENT_DATA)
-    assert result is None
\ No newline at end of file
+    assert result is None
+
+# --- Tests for validate_page ---
+
+def _future_event(title: str, **overrides) -> dict:
+    start = datetime.now(timezone.utc) + timedelta(days=7)
+    event = dict(MOCK_EVENT_DATA, title=title,
+                 start_at=start.isoformat(),
+                 ends_at=(start + timedelta(hours=2)).isoformat())
+    event.update(overrides)
+    return event
+
+def test_validate_page_keeps_valid_events_when_one_fails():
+    """A single invalid event should not discard the rest of the page."""
+    events = [
+        _future_event("First Event"),
+        _future_event("Bad <b> Title"),
+        _future_event("Second Event"),
+    ]
+    validated = validate_page(events)
+    assert [e["title"] for e in validated] == ["First Event", "Second Event"]
+
+def test_validate_page_drops_event_with_mixed_offset_datetimes():
+    """A naive ends_at next to an aware start_at fails that event only, not the whole page."""
+    events = [
+        _future_event("Aware Event"),
+        _future_event("Naive End Event", ends_at="2027-01-01T12:00:00"),
+    ]
+    validated = validate_page(events)
+    assert [e["title"] for e in validated] == ["Aware Event"]
+
+def test_validate_page_large_page_uses_process_pool():
+    """Pages at PROCESS_POOL_MIN_EVENTS or more are sanitized in worker processes with the same result."""
+    events = [_future_event(f"Pool Event {i}", description=f"<p>Details {i}</p>")
+              for i in range(scraper.PROCESS_POOL_MIN_EVENTS)]
+    events.append(_future_event("Pool <b> Bad"))
+    validated = validate_page(events)
+
+    assert scraper._PROCESS_POOL is not None
+    assert scraper._PROCESS_POOL._mp_context.get_start_method() != "fork"
+    assert [e["title"] for e in validated] == [f"Pool Event {i}" for i in range(scraper.PROCESS_POOL_MIN_EVENTS)]
+    assert validated[0]["description"] == "Details 0"
+
+def test_parse_listing_single_quoted_script_type():
+    """JSON-LD blocks are found regardless of attribute quoting or tag case."""
+    html = MOCK_HTML.replace('<script type="application/ld+json">', "<SCRIPT type='application/ld+json'>").replace("</script>", "</SCRIPT>")
+    events = parse_listing(html, "http://uoregon.edu")
+    assert len(events) == 1
+    assert events[0]['location'] == 'Virtual Meeting'
+
+# --- Tests for insert_events_to_db ---
+
+@patch('backend.src.scraper.scraper._prefetch_locations', side_effect=RuntimeError("db went away"))
+def test_insert_events_failed_batch_counts_every_event(mock_prefetch):
+    """When the batch transaction fails before any INSERT, every event is reported as failed."""
+    events = [
+        _future_event("Batch Failure One", website="http://uoregon.edu/details/batch-1"),
+        _future_event("Batch Failure Two", website="http://uoregon.edu/details/batch-2"),
+    ]
+    assert insert_events_to_db(events) == (0, 2)
+
+# --- Tests for crawl ---
+
+def _future_listing_html() -> str:
+    start = (datetime.now(timezone.utc) + timedelta(days=7)).replace(microsecond=0)
+    return (MOCK_HTML
+            .replace("2025-12-01T10:00:00-08:00", start.isoformat())
+            .replace("2025-12-01T12:00:00-08:00", (start + timedelta(hours=2)).isoformat()))
+
+@patch('backend.src.scraper.scraper.insert_events_to_db', return_value=(1, 0))
+@patch('backend.src.scraper.scraper.SESSION.get')
+def test_crawl_stops_at_first_404(mock_get, mock_insert, caplog):
+    """The first 404 ends the crawl cleanly; pages before it are inserted, the 404 is not retried."""
+    html = _future_listing_html()
+    pages = {"http://test.com": html, "http://test.com/calendar/2": html}
+    mock_get.side_effect = lambda url, timeout: (
+        _response(200, pages[url], url) if url in pages else _response(404, url=url)
+    )
+    with caplog.at_level("INFO", logger=scraper.logger.name):
+        crawl("http://test.com/")
+
+    assert mock_insert.call_count == 2
+    assert "Page 3 returned 404. Ending crawl." in caplog.text
+    assert "unexpected error" not in caplog.text
+    requested = [c.args[0] for c in mock_get.call_args_list]
+    assert requested.count("http://test.com/calendar/3") == 1
+
+@patch('backend.src.scraper.scraper.insert_events_to_db')
+@patch('backend.src.scraper.scraper.SESSION.get')
+def test_crawl_empty_first_page_bounds_requests(mock_get, mock_insert):
+    """Stopping on page 1 wastes at most the pages already in flight, not the whole MAX_PAGES range."""
+    mock_get.side_effect = lambda url, timeout: _response(200, "<html><body>No events.</body></html>", url)
+    crawl("http://test.com/")
+
+    mock_insert.assert_not_called()
+    assert mock_get.call_count <= scraper.FETCH_WORKERS < scraper.MAX_PAGES
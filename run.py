@@ -1,17 +1,26 @@
+import argparse
+import hashlib
 import os
 import platform
+import shutil
 import subprocess
 import sys
 import time
 import signal
+import socket
 import threading
+from urllib.parse import urlsplit
 import requests
 
 ROOT = os.path.dirname(os.path.abspath(__file__))
 
 def run(cmd, cwd=None):
-    """Run a command and return the Popen object."""
-    return subprocess.Popen(cmd, cwd=cwd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True)
+    """Run a command (argument list, no shell) and return the Popen object.
+
+    On POSIX the child leads its own process group so shutdown can signal it together with anything it spawned.
+    """
+    group = {} if platform.system() == "Windows" else {"start_new_session": True}
+    return subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, **group)
 
 def stream_process_output(proc, prefix=""):
     """Stream stdout of a subprocess in a separate thread."""
@@ -23,27 +32,75 @@ def stream_process_output(proc, prefix=""):
     thread.start()
     return thread
 
+def file_digest(path):
+    """SHA-256 hex digest of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def install_is_current(manifest, stamp):
+    """True if stamp records the digest of manifest from the last successful install."""
+    try:
+        with open(stamp) as f:
+            return f.read().strip() == file_digest(manifest)
+    except OSError:
+        return False
+
+def write_stamp(manifest, stamp):
+    """Record manifest's digest after a successful install."""
+    with open(stamp, "w") as f:
+        f.write(file_digest(manifest))
+
 def wait_for_backend(url="http://127.0.0.1:5000/", timeout=15):
-    """Wait until backend responds with status < 500 or timeout."""
-    start = time.time()
-    while time.time() - start < timeout:
+    """Wait until backend responds with status < 500 or timeout.
+
+    Polls with a cheap TCP connect every 50 ms and only issues the HTTP request once the port accepts connections.
+    """
+    parts = urlsplit(url)
+    address = (parts.hostname, parts.port or 80)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            socket.create_connection(address, timeout=0.1).close()
+        except OSError:
+            time.sleep(0.05)
+            continue
         try:
-            r = requests.get(url)
+            r = requests.get(url, timeout=max(0.1, deadline - time.time()))
             if r.status_code < 500:
                 return True
         except requests.exceptions.RequestException:
             pass
-        time.sleep(0.5)
+        time.sleep(0.05)
     return False
 
-def main():
+def parse_args(argv=None):
+    """Parse launcher flags; dependency installs are opt-in via --bootstrap."""
+    parser = argparse.ArgumentParser(description="Launch the DucksGather backend and frontend.")
+    parser.add_argument(
+        "--bootstrap",
+        action="store_true",
+        help="install/update backend (pip) and frontend (npm) dependencies before launching",
+    )
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    args = parse_args(argv)
     print("=== Ducks Gather Launcher ===\n")
 
+    # Fail fast instead of starting the backend and then failing on the frontend
+    npm_exec = shutil.which("npm")
+    if npm_exec is None:
+        print("Error: npm was not found on PATH. Install Node.js/npm and try again.")
+        return 1
+
     # --- 1. Create virtual environment if missing ---
     venv_path = os.path.join(ROOT, "venv")
+    # A fresh environment always needs its dependencies; otherwise installs only run with --bootstrap
+    install_backend = args.bootstrap
     if not os.path.exists(venv_path):
         print("Creating virtual environment...")
         subprocess.run([sys.executable, "-m", "venv", "venv"], check=True)
+        install_backend = True
 
     # --- 2. Determine Python executable in venv ---
     if platform.system() == "Windows":
@@ -52,18 +109,23 @@ def main():
         py_exec = os.path.join(venv_path, "bin", "python")
 
     # --- 3. Install backend dependencies ---
-    reqs_file = os.path.join(ROOT, "requirements.txt")
-    if os.path.exists(reqs_file):
-        print("Installing backend dependencies...")
-        subprocess.run([py_exec, "-m", "pip", "install", "-r", reqs_file],
-                       check=True,
-                       stdout=subprocess.DEVNULL,
-                       stderr=subprocess.DEVNULL)
+    reqs_file = os.path.join(ROOT, "backend", "requirements.txt")
+    reqs_stamp = os.path.join(venv_path, ".reqs.sha256")
+    if install_backend and os.path.exists(reqs_file):
+        # pip resolving an unchanged requirements file is slow; only reinstall when it changed
+        if install_is_current(reqs_file, reqs_stamp):
+            print("Backend dependencies up to date.")
+        else:
+            print("Installing backend dependencies...")
+            subprocess.run([py_exec, "-m", "pip", "install", "-r", reqs_file],
+                           check=True,
+                           stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL)
+            write_stamp(reqs_file, reqs_stamp)
 
     # --- 4. Start backend ---
     print("Starting backend...")
-    backend_cmd = f'"{py_exec}" -m backend.src.app' if platform.system() == "Windows" else f"{py_exec} -m backend.src.app"
-    backend_proc = run(backend_cmd, cwd=ROOT)
+    backend_proc = run([py_exec, "-m", "backend.src.app"], cwd=ROOT)
     stream_process_output(backend_proc, prefix="[BACKEND] ")
 
     # Wait for backend to respond
@@ -75,20 +137,35 @@ def main():
 
     # --- 5. Start frontend ---
     frontend_dir = os.path.join(ROOT, "frontend")
-    print("Installing frontend dependencies (npm install)...")
-    subprocess.run("npm install", cwd=frontend_dir, shell=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    npm_manifest = os.path.join(frontend_dir, "package-lock.json")
+    if not os.path.exists(npm_manifest):
+        npm_manifest = os.path.join(frontend_dir, "package.json")
+    npm_stamp = os.path.join(frontend_dir, "node_modules", ".package-lock.sha256")
+    install_frontend = args.bootstrap or not os.path.isdir(os.path.join(frontend_dir, "node_modules"))
+    if install_frontend and install_is_current(npm_manifest, npm_stamp):
+        print("Frontend dependencies up to date.")
+    elif install_frontend:
+        print("Installing frontend dependencies (npm install)...")
+        npm_install = subprocess.run([npm_exec, "install"], cwd=frontend_dir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        if npm_install.returncode == 0:
+            write_stamp(npm_manifest, npm_stamp)
 
     print("Launching frontend...")
     try:
-        subprocess.run("npm start", cwd=frontend_dir, shell=True)
+        subprocess.run([npm_exec, "start"], cwd=frontend_dir)
     finally:
         print("\nShutting down backend...")
         if platform.system() == "Windows":
             backend_proc.terminate()
         else:
-            os.kill(backend_proc.pid, signal.SIGTERM)
+            # The backend leads its own process group (see run()), so this also reaches any reloader children
+            try:
+                os.killpg(backend_proc.pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
 
     print("All done.")
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())